@@ -1,5 +1,13 @@
 """nsfc_final_report package"""
 
-from .client import NSFCClient
+__all__ = ["NSFCClient", "load_job_spec", "search_record"]
 
-__all__ = ["NSFCClient"]
+
+def __getattr__(name):
+    # import the HTTP client on first use, so the standard-library-only helpers
+    # (tree_index, profiling, fsutil) used by the OCR scripts stay cheap to import
+    if name in __all__:
+        from . import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,111 @@
+"""In-process cache for hot NSFCClient lookups.
+
+LookupCache combines a bounded LRU with per-entry TTL and single-flight request
+coalescing: while a value is being loaded, other threads asking for the same key
+wait for that one load instead of issuing their own request. Errors are handed to
+every waiting caller but never cached, and neither are values the caller marks as
+not cacheable (e.g. a "not found" answer from a flaky endpoint).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LookupCache:
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """maxsize=0 disables storing results (identical concurrent calls are still coalesced)."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], object],
+        cacheable: Optional[Callable[[object], bool]] = None,
+    ):
+        """Return the cached value for key, loading it with loader() on a miss.
+
+        If cacheable is given, a loaded value is only stored when cacheable(value) is
+        true; callers waiting on the same load still receive it.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+        store = False
+        try:
+            call.value = loader()
+            store = self.maxsize > 0 and (cacheable is None or cacheable(call.value))
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            try:
+                with self._lock:
+                    if store:
+                        self._data[key] = (self._clock() + self.ttl, call.value)
+                        self._data.move_to_end(key)
+                        while len(self._data) > self.maxsize:
+                            self._data.popitem(last=False)
+                            self.evictions += 1
+            finally:
+                # never leave waiters blocked on a load that has ended
+                with self._lock:
+                    del self._inflight[key]
+                call.event.set()
+        return call.value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._data),
+            }
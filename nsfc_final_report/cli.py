@@ -1,27 +1,55 @@
 import argparse
+import json
+import os
+import sys
 
-from .client import NSFCClient
+from .client import NSFCClient, load_job_spec, search_record
+from .profiling import add_profile_args, profiled
 
 
 def main():
     parser = argparse.ArgumentParser(prog="nsfc-final-report")
     sub = parser.add_subparsers(dest="cmd")
 
-    p_search = sub.add_parser("search")
+    common = argparse.ArgumentParser(add_help=False)
+    add_profile_args(common)
+
+    p_search = sub.add_parser("search", parents=[common])
     p_search.add_argument("--keyword", "-k", default="")
     p_search.add_argument("--page", type=int, default=0)
     p_search.add_argument("--size", type=int, default=10)
+    p_search.add_argument(
+        "--all", action="store_true", help="fetch every page, streaming rows"
+    )
+    p_search.add_argument(
+        "--format",
+        choices=["dict", "jsonl"],
+        default="dict",
+        help="dict: print the response as a Python dict (one row per line with --all); "
+        "jsonl: one JSON search record per line",
+    )
+    p_search.add_argument(
+        "--prefetch",
+        type=int,
+        default=2,
+        help="with --all, number of pages to fetch ahead in the background",
+    )
+    p_search.add_argument(
+        "--checkpoint",
+        default=None,
+        help="with --all, save the page cursor here and resume from it on restart",
+    )
 
-    p_info = sub.add_parser("info")
+    p_info = sub.add_parser("info", parents=[common])
     p_info.add_argument("project_id")
 
-    p_dl = sub.add_parser("download")
+    p_dl = sub.add_parser("download", parents=[common])
     p_dl.add_argument("project_id")
     p_dl.add_argument("--out", "-o", default=None)
     p_dl.add_argument("--max-pages", type=int, default=50)
     p_dl.add_argument("--force", action="store_true", help="redownload existing files")
 
-    p_batch = sub.add_parser("batch")
+    p_batch = sub.add_parser("batch", parents=[common])
     p_batch.add_argument("--keyword", "-k", default="")
     p_batch.add_argument("--out", "-o", default=None)
     p_batch.add_argument("--page-size", type=int, default=10)
@@ -29,14 +57,32 @@ def main():
     p_batch.add_argument(
         "--jsonl", default=None, help="path to write search results jsonl"
     )
+    p_batch.add_argument(
+        "--jobs",
+        default=None,
+        help="job spec file (JSON array or JSON lines) of queries to run together "
+        "instead of --keyword; projects matched by several queries are fetched once",
+    )
+    p_batch.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the search checkpoint and harvest search results from page 0",
+    )
 
     args = parser.parse_args()
+    with profiled(args):
+        run(parser, args)
+
+
+def run(parser, args):
     client = NSFCClient()
     if args.cmd == "search":
-        res = client.search(
-            fuzzyKeyword=args.keyword, pageNum=args.page, pageSize=args.size
-        )
-        print(res)
+        try:
+            search(client, args)
+        except BrokenPipeError:
+            # downstream consumer (e.g. `head`) went away; silence the flush at exit
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
     elif args.cmd == "info":
         print(client.get_project_info(args.project_id))
     elif args.cmd == "download":
@@ -47,6 +93,22 @@ def main():
             force=args.force,
         )
         print("\n".join(files))
+    elif args.cmd == "batch" and args.jobs:
+        if args.keyword:
+            parser.error("batch: --keyword cannot be used with --jobs")
+        try:
+            queries = load_job_spec(args.jobs)
+        except ValueError as e:
+            parser.error(f"batch: {args.jobs}: {e}")
+        processed = client.batch_fetch_jobs(
+            queries,
+            out_dir=args.out,
+            pageSize=args.page_size,
+            force=args.force,
+            jsonl_path=args.jsonl,
+            resume=not args.restart,
+        )
+        print("\n".join(processed))
     elif args.cmd == "batch":
         processed = client.batch_fetch(
             fuzzyKeyword=args.keyword,
@@ -54,7 +116,32 @@ def main():
             pageSize=args.page_size,
             force=args.force,
             jsonl_path=args.jsonl,
+            resume=not args.restart,
         )
         print("\n".join(processed))
     else:
         parser.print_help()
+
+
+def search(client, args):
+    if args.all:
+        rows = client.search_all(
+            fuzzyKeyword=args.keyword,
+            pageSize=args.size,
+            prefetch=args.prefetch,
+            checkpoint_path=args.checkpoint,
+        )
+    else:
+        res = client.search(
+            fuzzyKeyword=args.keyword, pageNum=args.page, pageSize=args.size
+        )
+        if args.format == "dict":
+            print(res)
+            return
+        rows = res.get("data", {}).get("resultsData", [])
+    for row in rows:
+        if args.format == "jsonl":
+            line = json.dumps(search_record(row), ensure_ascii=False)
+        else:
+            line = repr(row)
+        print(line, flush=True)
@@ -1,12 +1,18 @@
 import base64
 import logging
 import os
+import queue
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 import requests
 from Crypto.Cipher import DES
 
+from .cache import LookupCache
+from .fsutil import tail_matches, tail_state, write_json_atomic
+from .profiling import stage
+
 DEFAULT_BASE = "https://kd.nsfc.cn"
 
 _env_key = os.environ.get("NSFC_DES_KEY")
@@ -25,11 +31,192 @@ else:
     )
 
 
+_END = object()
+
+
+def _backoff(seconds: float) -> None:
+    with stage("backoff_sleep"):
+        time.sleep(seconds)
+
+
+def _read_ahead(iterable: Iterable, size: int) -> Iterator:
+    """Consume iterable in a background thread, buffering at most `size` items.
+
+    Items (or the exception raised by iterable) are handed over through a bounded
+    queue, so the producer blocks once it is `size` items ahead. Closing the
+    returned generator early stops the producer.
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except BaseException as e:
+            put((False, e))
+            return
+        put((True, _END))
+
+    t = threading.Thread(target=worker, name="nsfc-read-ahead", daemon=True)
+    t.start()
+    try:
+        while True:
+            ok, item = q.get()
+            if not ok:
+                raise item
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _search_query(fuzzyKeyword: str, pageSize: int, filters: Dict) -> Dict:
+    return {"fuzzyKeyword": fuzzyKeyword, "pageSize": pageSize, **filters}
+
+
+def load_search_checkpoint(checkpoint_path: Optional[str], query: Dict) -> Dict:
+    """Return the saved pagination cursor for query, or a fresh one.
+
+    A checkpoint is {"query", "next_page", "itotalRecords", "rows", "done"} plus
+    whatever the harvester stores (batch_fetch adds the jsonl byte "offset" and the
+    position and sha1 of the last line written). Only an unfinished harvest of the
+    same query is resumed; a missing, unreadable, finished or different-query
+    checkpoint yields a fresh cursor.
+    """
+    fresh = {
+        "query": query,
+        "next_page": 0,
+        "itotalRecords": None,
+        "rows": 0,
+        "done": False,
+    }
+    state = _read_checkpoint(checkpoint_path)
+    if state is None or state.get("query") != query or state.get("done"):
+        return fresh
+    return {**fresh, **state}
+
+
+def _read_checkpoint(checkpoint_path: Optional[str]) -> Optional[Dict]:
+    import json
+
+    if not checkpoint_path:
+        return None
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _save_checkpoint(checkpoint_path: str, state: Dict) -> None:
+    write_json_atomic(checkpoint_path, state, ensure_ascii=False)
+
+
+def _is_ok_response(j) -> bool:
+    # API bodies carry their own status; only successful ones are worth caching
+    return isinstance(j, dict) and j.get("code", 200) == 200
+
+
+def search_record(row, **extra) -> Dict:
+    """Wrap a raw search row as written to search_results.jsonl ({"project_id", "raw"})."""
+    # row is a list per observed format; try to extract id and basic fields
+    try:
+        proj_id = row[0]
+    except Exception:
+        proj_id = None
+    return {"project_id": proj_id, **extra, "raw": row}
+
+
+# filters NSFCClient.search() reads from **kwargs; keep in sync with its payload
+SEARCH_FILTERS = (
+    "conclusionYear",
+    "dependUnit",
+    "keywords",
+    "projectType",
+    "projectTypeName",
+    "code",
+    "ratifyYear",
+    "order",
+    "ordering",
+)
+# search parameters the harvesters set themselves
+_RESERVED_JOB_KEYS = ("pageNum", "pageSize", "isFuzzySearch", "complete")
+
+
+def load_job_spec(path: str) -> List[Dict]:
+    """Load a batch job spec listing several search queries.
+
+    The file is either a JSON array or JSON lines, one query object per entry, e.g.
+    {"name": "heart-2020", "keyword": "心肌", "conclusionYear": "2020", "code": "H02"}.
+    "keyword" (or "fuzzyKeyword") is the search text and every other key except "name"
+    must be one of SEARCH_FILTERS, passed to search() as a filter. Queries without a
+    name get "query_<n>". Unknown or reserved keys and duplicate names raise ValueError.
+    """
+    import json
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    queries = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"job spec entry {i} is not an object: {entry!r}")
+        q = dict(entry)
+        if "fuzzyKeyword" in q:
+            q.setdefault("keyword", q.pop("fuzzyKeyword"))
+        q.setdefault("keyword", "")
+        q.setdefault("name", f"query_{i}")
+        reserved = [k for k in q if k in _RESERVED_JOB_KEYS]
+        if reserved:
+            raise ValueError(
+                f"job spec entry {i} ({q['name']!r}): {', '.join(reserved)} "
+                "cannot be set per query"
+            )
+        unknown = [k for k in q if k not in ("name", "keyword", *SEARCH_FILTERS)]
+        if unknown:
+            raise ValueError(
+                f"job spec entry {i} ({q['name']!r}): unknown key(s) "
+                f"{', '.join(unknown)}; filters are {', '.join(SEARCH_FILTERS)}"
+            )
+        if any(prev["name"] == q["name"] for prev in queries):
+            raise ValueError(f"job spec entry {i}: duplicate name {q['name']!r}")
+        queries.append(q)
+    return queries
+
+
 class NSFCClient:
-    def __init__(self, base_url: str = DEFAULT_BASE, timeout: int = 20):
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE,
+        timeout: int = 20,
+        cache_size: int = 256,
+        cache_ttl: float = 300.0,
+    ):
+        """cache_size/cache_ttl bound the in-memory cache of get_project_info and
+        get_report_page_url results; identical concurrent lookups share one request
+        (cache_size=0 keeps the coalescing but stores nothing). Cached values are
+        shared between callers and must not be mutated.
+        """
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
         self.timeout = timeout
+        self._lookups = LookupCache(maxsize=cache_size, ttl=cache_ttl)
         self.headers = {
             "Accept": "application/json, text/plain, */*",
             "Accept-Encoding": "gzip, deflate, br, zstd",
@@ -81,44 +268,103 @@ class NSFCClient:
             "keywordsScreening": "",
             "projectTypeNameScreening": "",
         }
-        r = self.session.post(
-            url, json=payload, headers=self.headers, timeout=self.timeout
-        )
-        r.raise_for_status()
-        enc = r.text
+        with stage("search_request"):
+            r = self.session.post(
+                url, json=payload, headers=self.headers, timeout=self.timeout
+            )
+            r.raise_for_status()
+            enc = r.text
         # response is DES ECB encrypted JSON, base64 encoded
         try:
-            dec = self._des_decrypt(enc)
+            with stage("des_decode"):
+                dec = self._des_decrypt(enc)
         except Exception:
             # some endpoints may return plaintext JSON
-            return r.json()
+            with stage("json_parse"):
+                return r.json()
         import json as _json
 
-        return _json.loads(dec.decode("utf-8"))
+        with stage("json_parse"):
+            return _json.loads(dec.decode("utf-8"))
 
-    def search_all(self, fuzzyKeyword: str = "", pageSize: int = 10, **kwargs):
+    def search_all(
+        self,
+        fuzzyKeyword: str = "",
+        pageSize: int = 10,
+        prefetch: int = 2,
+        checkpoint_path: Optional[str] = None,
+        **kwargs,
+    ):
         """Iterate through all pages of search results and yield raw result entries.
         Each page's JSON has data.resultsData which is a list of result rows.
 
-        pageNum starts at 0 and increments by 1 each loop.
+        pageNum starts at 0 and increments by 1 each loop. With prefetch > 0 pages are
+        fetched by a background thread that runs up to `prefetch` pages ahead of the
+        consumer; prefetch=0 fetches each page only when the previous one is used up.
+
+        With checkpoint_path the pagination cursor is saved there once every row of a
+        page has been consumed; a later call with the same query resumes after the last
+        finished page (rows of a partly consumed page are yielded again). Once the
+        harvest is complete, the next call with the same checkpoint searches from page 0.
         """
-        page = 0
-        import time
+        query = _search_query(fuzzyKeyword, pageSize, kwargs)
+        state = load_search_checkpoint(checkpoint_path, query)
+        for _page, results in self._checkpointed_pages(
+            state, checkpoint_path, prefetch
+        ):
+            yield from results
+
+    def _checkpointed_pages(
+        self, state: Dict, checkpoint_path: Optional[str], prefetch: int = 2
+    ):
+        """Yield (pageNum, resultsData) from state["next_page"] on, saving the cursor.
+
+        The checkpoint for a page is written when the consumer asks for the next one, so
+        anything the consumer stores in `state` while handling a page (e.g. a file
+        offset) is saved with it.
+        """
+        q = state["query"]
+        filters = {k: v for k, v in q.items() if k not in ("fuzzyKeyword", "pageSize")}
+        pages = self._iter_search_pages(
+            fuzzyKeyword=q["fuzzyKeyword"],
+            pageSize=q["pageSize"],
+            start_page=state["next_page"],
+            **filters,
+        )
+        if prefetch > 0:
+            pages = _read_ahead(pages, prefetch)
+        for page, results, itotal in pages:
+            yield page, results
+            state["next_page"] = page + 1
+            state["itotalRecords"] = itotal
+            state["rows"] += len(results)
+            if checkpoint_path:
+                _save_checkpoint(checkpoint_path, state)
+        state["done"] = True
+        if checkpoint_path:
+            _save_checkpoint(checkpoint_path, state)
+
+    def _iter_search_pages(
+        self, fuzzyKeyword: str = "", pageSize: int = 10, start_page: int = 0, **kwargs
+    ):
+        """Yield (pageNum, resultsData, itotalRecords) for each non-empty search page, with retries."""
+        page = start_page
 
         while True:
             # retry search on transient errors
             for attempt in range(1, 4):
                 try:
-                    res = self.search(
-                        fuzzyKeyword=fuzzyKeyword,
-                        pageNum=page,
-                        pageSize=pageSize,
-                        **kwargs,
-                    )
+                    with stage("search_page"):
+                        res = self.search(
+                            fuzzyKeyword=fuzzyKeyword,
+                            pageNum=page,
+                            pageSize=pageSize,
+                            **kwargs,
+                        )
                     break
                 except Exception:
                     if attempt < 3:
-                        time.sleep(2 ** (attempt - 1))
+                        _backoff(2 ** (attempt - 1))
                         continue
                     else:
                         raise
@@ -126,9 +372,8 @@ class NSFCClient:
             results = data.get("resultsData", [])
             if not results:
                 break
-            for row in results:
-                yield row
             itotal = data.get("itotalRecords")
+            yield page, results, itotal
             # stop if we've covered all
             if itotal is not None:
                 already = (page + 1) * pageSize
@@ -143,11 +388,20 @@ class NSFCClient:
         pageSize: int = 50,
         force: bool = False,
         jsonl_path: Optional[str] = None,
+        resume: bool = True,
+        prefetch: int = 2,
         **kwargs,
     ) -> List[str]:
         """Perform full search (all pages), write each search-result row to a jsonl file, then for each project id fetch detailed info and download report.
 
         - jsonl_path: path to write search results (defaults to <out_dir>/search_results.jsonl)
+        - The search cursor is checkpointed in <jsonl_path>.checkpoint.json after each page.
+          With resume (the default) an interrupted harvest of the same query continues
+          from the last finished page and appends to the jsonl without duplicates, as
+          long as the jsonl still ends with the last checkpointed line; a finished
+          harvest, or resume=False, starts the search over.
+        - prefetch: number of search pages fetched ahead in the background (see search_all).
+        - Any other keyword arguments are search filters passed to search().
         - For each project, create dir <out_dir>/<project_id>/ and save info.json and report pages there.
         Returns list of project ids processed.
         """
@@ -158,19 +412,21 @@ class NSFCClient:
         os.makedirs(out_dir, exist_ok=True)
         if jsonl_path is None:
             jsonl_path = os.path.join(out_dir, "search_results.jsonl")
+        checkpoint_path = jsonl_path + ".checkpoint.json"
+        query = _search_query(fuzzyKeyword, pageSize, kwargs)
+        state = load_search_checkpoint(checkpoint_path if resume else None, query)
+        offset = state.get("offset", 0)
+        if offset and not tail_matches(jsonl_path, state):
+            # output is missing or not the file we checkpointed: harvest from scratch
+            state = load_search_checkpoint(None, query)
+            offset = 0
         processed = []
-        # write search results
-        with open(jsonl_path, "w", encoding="utf-8") as jf:
-            for row in self.search_all(
-                fuzzyKeyword=fuzzyKeyword, pageSize=pageSize, **kwargs
-            ):
-                # row is a list per observed format; try to extract id and basic fields
-                try:
-                    proj_id = row[0]
-                except Exception:
-                    proj_id = None
-                obj = {"project_id": proj_id, "raw": row}
-                jf.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        # write search results; anything after the last checkpointed page is dropped
+        mode = "r+b" if offset else "wb"
+        with stage("search_phase"), open(jsonl_path, mode) as jf:
+            jf.seek(offset)
+            jf.truncate()
+            self._write_search_pages(jf, state, checkpoint_path, prefetch)
         # now iterate jsonl and fetch details + reports
         with open(jsonl_path, "r", encoding="utf-8") as jf:
             for line in jf:
@@ -181,95 +437,242 @@ class NSFCClient:
                 pid = obj.get("project_id")
                 if not pid:
                     continue
-                pdir = os.path.join(out_dir, pid)
-                os.makedirs(pdir, exist_ok=True)
-                # fetch project info with retries; always write an info.json (success or error)
-                info = None
-                info_path = os.path.join(pdir, "info.json")
-                for attempt in range(1, 4):
-                    try:
-                        info = self.get_project_info(pid)
-                        break
-                    except Exception as e:
-                        last_exc = e
-                        time.sleep(1 if attempt == 1 else 2)
-                        continue
-                if info is not None:
-                    try:
-                        with open(info_path, "w", encoding="utf-8") as fih:
-                            json.dump(info, fih, ensure_ascii=False, indent=2)
-                    except Exception:
-                        # best-effort write
-                        pass
-                else:
-                    # write an error placeholder so directory is not empty
-                    try:
-                        with open(info_path, "w", encoding="utf-8") as fih:
-                            json.dump(
-                                {"error": f"failed to fetch info: {repr(last_exc)}"},
-                                fih,
-                                ensure_ascii=False,
-                                indent=2,
-                            )
-                    except Exception:
-                        pass
-
-                # download report into project dir; capture errors into errors.json if any
-                try:
-                    files = self.download_report(
-                        pid, out_dir=pdir, max_pages=50, force=force
-                    )
-                    # write a manifest of downloaded files
-                    try:
-                        with open(
-                            os.path.join(pdir, "files.json"), "w", encoding="utf-8"
-                        ) as ff:
-                            json.dump(files, ff, ensure_ascii=False, indent=2)
-                    except Exception:
-                        pass
-                except Exception as e:
-                    try:
-                        with open(
-                            os.path.join(pdir, "errors.json"), "w", encoding="utf-8"
-                        ) as ef:
-                            json.dump(
-                                {"download_error": repr(e)},
-                                ef,
-                                ensure_ascii=False,
-                                indent=2,
-                            )
-                    except Exception:
-                        pass
+                with stage("project"):
+                    self._fetch_project(pid, os.path.join(out_dir, pid), force=force)
                 processed.append(pid)
         return processed
 
+    def _write_search_pages(
+        self, jf, state: Dict, checkpoint_path: Optional[str], prefetch: int, **extra
+    ) -> None:
+        """Append a search_record line (with extra fields) per row of the harvest in state.
+
+        jf is a binary file positioned at state's "offset". After each page the file is
+        fsynced and state gets the new offset plus where the last line starts and its
+        sha1, which _checkpointed_pages saves with the cursor.
+        """
+        import json
+
+        for _page, results in self._checkpointed_pages(
+            state, checkpoint_path, prefetch
+        ):
+            line = b""
+            for row in results:
+                obj = search_record(row, **extra)
+                line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+                jf.write(line)
+            jf.flush()
+            os.fsync(jf.fileno())
+            # identify the file by its last line so a rewritten jsonl is not resumed
+            state.update(tail_state(jf.tell(), line))
+
+    def batch_fetch_jobs(
+        self,
+        queries: List[Dict],
+        out_dir: Optional[str] = None,
+        pageSize: int = 50,
+        force: bool = False,
+        jsonl_path: Optional[str] = None,
+        resume: bool = True,
+        prefetch: int = 2,
+    ) -> List[str]:
+        """Run several searches, deduplicate project ids across them and fetch each project once.
+
+        - queries: list of dicts as returned by load_job_spec; each has a "name", a "keyword"
+          and optional search filters (conclusionYear, projectType, code, ...).
+        - Search rows of every query are written to jsonl_path (defaults to
+          <out_dir>/search_results.jsonl) with the query name attached; <out_dir>/project_queries.json
+          maps each project id to the names of the queries that matched it, and the same
+          list is saved as queries.json in each project dir.
+        - The current query and its page cursor are checkpointed in
+          <jsonl_path>.jobs-checkpoint.json after each page. With resume (the default) a
+          run of the same job list that failed part way continues with the unfinished
+          query, keeping the rows of the queries already harvested; resume=False starts over.
+        - prefetch: number of search pages fetched ahead in the background (see search_all).
+        Returns list of unique project ids processed, in first-seen order.
+        """
+        import json
+
+        if out_dir is None:
+            out_dir = os.path.join(os.getcwd(), "data", "batch")
+        os.makedirs(out_dir, exist_ok=True)
+        if jsonl_path is None:
+            jsonl_path = os.path.join(out_dir, "search_results.jsonl")
+        checkpoint_path = jsonl_path + ".jobs-checkpoint.json"
+        jobs = {"queries": queries, "pageSize": pageSize}
+        state = _read_checkpoint(checkpoint_path if resume else None)
+        first = len(queries)
+        if (
+            state is not None
+            and state.get("jobs") == jobs
+            and (not state.get("offset") or tail_matches(jsonl_path, state))
+        ):
+            # continue the unfinished query, or the one after the last finished query
+            first = state["job"] + (1 if state["done"] else 0)
+        if first >= len(queries):
+            # no unfinished run of these jobs over this jsonl: harvest from scratch
+            state = {"jobs": jobs, "job": -1, "offset": 0}
+            first = 0
+        offset = state["offset"]
+        mode = "r+b" if offset else "wb"
+        with stage("search_phase"), open(jsonl_path, mode) as jf:
+            jf.seek(offset)
+            jf.truncate()
+            for i in range(first, len(queries)):
+                q = queries[i]
+                if state["job"] != i:
+                    filters = {
+                        k: v for k, v in q.items() if k not in ("name", "keyword")
+                    }
+                    query = _search_query(q.get("keyword", ""), pageSize, filters)
+                    state.update(load_search_checkpoint(None, query), job=i)
+                self._write_search_pages(
+                    jf, state, checkpoint_path, prefetch, query=q["name"]
+                )
+
+        matches: Dict[str, List[str]] = {}
+        with open(jsonl_path, "r", encoding="utf-8") as jf:
+            for line in jf:
+                try:
+                    obj = json.loads(line)
+                except Exception:
+                    continue
+                proj_id = obj.get("project_id")
+                if not proj_id:
+                    continue
+                names = matches.setdefault(proj_id, [])
+                if obj.get("query") not in names:
+                    names.append(obj.get("query"))
+        write_json_atomic(
+            os.path.join(out_dir, "project_queries.json"),
+            matches,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+        processed = []
+        for pid, names in matches.items():
+            pdir = os.path.join(out_dir, pid)
+            with stage("project"):
+                self._fetch_project(pid, pdir, force=force)
+            try:
+                with open(
+                    os.path.join(pdir, "queries.json"), "w", encoding="utf-8"
+                ) as qf:
+                    json.dump(names, qf, ensure_ascii=False, indent=2)
+            except Exception:
+                pass
+            processed.append(pid)
+        return processed
+
+    def _fetch_project(self, pid: str, pdir: str, force: bool = False) -> None:
+        """Fetch info.json and report pages for one project into pdir (best effort)."""
+        import json
+
+        os.makedirs(pdir, exist_ok=True)
+        # fetch project info with retries; always write an info.json (success or error)
+        info = None
+        info_path = os.path.join(pdir, "info.json")
+        for attempt in range(1, 4):
+            try:
+                info = self.get_project_info(pid)
+                break
+            except Exception as e:
+                last_exc = e
+                _backoff(1 if attempt == 1 else 2)
+                continue
+        if info is not None:
+            try:
+                with open(info_path, "w", encoding="utf-8") as fih:
+                    json.dump(info, fih, ensure_ascii=False, indent=2)
+            except Exception:
+                # best-effort write
+                pass
+        else:
+            # write an error placeholder so directory is not empty
+            try:
+                with open(info_path, "w", encoding="utf-8") as fih:
+                    json.dump(
+                        {"error": f"failed to fetch info: {repr(last_exc)}"},
+                        fih,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
+            except Exception:
+                pass
+
+        # download report into project dir; capture errors into errors.json if any
+        try:
+            files = self.download_report(pid, out_dir=pdir, max_pages=50, force=force)
+            # write a manifest of downloaded files
+            try:
+                with open(
+                    os.path.join(pdir, "files.json"), "w", encoding="utf-8"
+                ) as ff:
+                    json.dump(files, ff, ensure_ascii=False, indent=2)
+            except Exception:
+                pass
+        except Exception as e:
+            try:
+                with open(
+                    os.path.join(pdir, "errors.json"), "w", encoding="utf-8"
+                ) as ef:
+                    json.dump(
+                        {"download_error": repr(e)},
+                        ef,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
+            except Exception:
+                pass
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit, miss, coalesce and eviction counters of the lookup cache."""
+        return self._lookups.stats()
+
     def get_project_info(self, project_id: str) -> Dict:
-        url = f"{self.base_url}/api/baseQuery/conclusionProjectInfo/{project_id}"
-        r = self.session.post(
-            url,
-            headers={
-                **self.headers,
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
-            timeout=self.timeout,
+        return self._lookups.get(
+            ("info", project_id),
+            lambda: self._fetch_project_info(project_id),
+            cacheable=_is_ok_response,
         )
-        r.raise_for_status()
-        return r.json()
+
+    def _fetch_project_info(self, project_id: str) -> Dict:
+        url = f"{self.base_url}/api/baseQuery/conclusionProjectInfo/{project_id}"
+        with stage("info_fetch"):
+            r = self.session.post(
+                url,
+                headers={
+                    **self.headers,
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+                timeout=self.timeout,
+            )
+            r.raise_for_status()
+            return r.json()
 
     def get_report_page_url(self, project_id: str, index: int) -> Optional[str]:
+        return self._lookups.get(
+            ("page_url", project_id, index),
+            lambda: self._fetch_report_page_url(project_id, index),
+            cacheable=lambda url: url is not None,
+        )
+
+    def _fetch_report_page_url(self, project_id: str, index: int) -> Optional[str]:
         url = f"{self.base_url}/api/baseQuery/completeProjectReport"
         payload = {"id": project_id, "index": index}
-        r = self.session.post(
-            url,
-            data=payload,
-            headers={
-                **self.headers,
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
-            timeout=self.timeout,
-        )
-        r.raise_for_status()
-        j = r.json()
+        with stage("page_url"):
+            r = self.session.post(
+                url,
+                data=payload,
+                headers={
+                    **self.headers,
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+                timeout=self.timeout,
+            )
+            r.raise_for_status()
+            j = r.json()
         if not j or j.get("code") != 200:
             return None
         url_path = j.get("data", {}).get("url")
@@ -288,7 +691,6 @@ class NSFCClient:
             out_dir = os.path.join(os.getcwd(), "data", "reports", project_id)
         os.makedirs(out_dir, exist_ok=True)
         downloaded = []
-        import time
 
         for idx in range(1, max_pages + 1):
             img_url = self.get_report_page_url(project_id, idx)
@@ -298,14 +700,15 @@ class NSFCClient:
             for attempt in range(1, 4):
                 try:
                     # include Referer header to mimic browser fetching the image
-                    resp = self.session.get(
-                        img_url,
-                        timeout=self.timeout,
-                        headers={
-                            **self.headers,
-                            "Referer": f"https://kd.nsfc.cn/finalDetails?id={project_id}",
-                        },
-                    )
+                    with stage("image_transfer"):
+                        resp = self.session.get(
+                            img_url,
+                            timeout=self.timeout,
+                            headers={
+                                **self.headers,
+                                "Referer": f"https://kd.nsfc.cn/finalDetails?id={project_id}",
+                            },
+                        )
                     if resp.status_code == 404:
                         success = False
                         break
@@ -320,7 +723,7 @@ class NSFCClient:
                         downloaded.append(filename)
                         success = True
                         break
-                    with open(filename, "wb") as fh:
+                    with stage("disk_write"), open(filename, "wb") as fh:
                         fh.write(resp.content)
                     downloaded.append(filename)
                     success = True
@@ -333,14 +736,14 @@ class NSFCClient:
                     # on 503/429/403 try backoff and retry a few times, otherwise give up on this page
                     if attempt < 3:
                         backoff = 2 ** (attempt - 1)
-                        time.sleep(backoff)
+                        _backoff(backoff)
                         continue
                     else:
                         # give up this page and continue to next
                         break
                 except Exception:
                     if attempt < 3:
-                        time.sleep(2 ** (attempt - 1))
+                        _backoff(2 ** (attempt - 1))
                         continue
                     else:
                         break
@@ -0,0 +1,47 @@
+"""Small file-system helpers shared by the client, the indexer and the OCR scripts."""
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+
+def write_json_atomic(path: str, obj, **dump_kwargs) -> None:
+    """Write obj as JSON to path via a temp file and os.replace.
+
+    Readers see either the previous file or the complete new one, never a torn
+    write, so checkpoints and manifests survive a crash mid-save.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, **dump_kwargs)
+    os.replace(tmp, path)
+
+
+def tail_state(offset: int, chunk: bytes) -> Dict:
+    """Checkpoint fields identifying an append-only file whose last write was chunk.
+
+    offset is the file size after writing chunk; store the result with the cursor and
+    check it with tail_matches before appending to the file again.
+    """
+    return {
+        "offset": offset,
+        "tail_start": offset - len(chunk),
+        "tail_sha1": hashlib.sha1(chunk).hexdigest(),
+    }
+
+
+def tail_matches(path: str, state: Dict) -> bool:
+    """True if path still holds, ending at state["offset"], the chunk recorded there."""
+    offset = state.get("offset", 0)
+    start = state.get("tail_start")
+    digest = state.get("tail_sha1")
+    if start is None or digest is None or not 0 <= start < offset:
+        return False
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            tail = f.read(offset - start)
+    except OSError:
+        return False
+    return len(tail) == offset - start and hashlib.sha1(tail).hexdigest() == digest
@@ -0,0 +1,190 @@
+"""Lightweight stage profiler for the CLI and OCR scripts.
+
+Code marks interesting regions with ``with stage("name"):``; when no Profiler is
+active this is a no-op. An active Profiler aggregates wall and thread CPU time per
+stage (nested stages form a stack), optionally runs cProfile and tracemalloc, and
+writes a JSON report plus a collapsed-stack file usable with flamegraph tools.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+_active: Optional["Profiler"] = None
+
+
+def stage(name: str):
+    """Context manager timing a stage on the active profiler (no-op if none)."""
+    p = _active
+    if p is None:
+        return nullcontext()
+    return p.stage(name)
+
+
+def add_profile_args(parser) -> None:
+    """Add --profile, --profile-cprofile and --profile-memory to an argparse parser."""
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PREFIX",
+        help="write per-stage timings to PREFIX.json and PREFIX.collapsed on exit",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        action="store_true",
+        help="with --profile, also run cProfile and write PREFIX.pstats",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="with --profile, record peak memory with tracemalloc",
+    )
+
+
+@contextmanager
+def profiled(args):
+    """Run the body under a Profiler when args.profile is set; writes it on exit."""
+    prefix = getattr(args, "profile", None)
+    if not prefix:
+        yield None
+        return
+    p = Profiler(
+        cprofile=args.profile_cprofile, trace_memory=args.profile_memory
+    ).start()
+    try:
+        yield p
+    finally:
+        p.stop()
+        p.write(prefix)
+
+
+class Profiler:
+    def __init__(self, cprofile: bool = False, trace_memory: bool = False):
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # stack path ("a;b;c") -> [count, wall, cpu, child_wall]
+        self._stacks: Dict[str, list] = {}
+        self._prof = None
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self._start_children = 0.0
+        self._wall = 0.0
+        self._cpu = 0.0
+        self._children_cpu = 0.0
+        self._peak_memory = None
+
+    def start(self) -> "Profiler":
+        global _active
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        if self.cprofile:
+            import cProfile
+
+            self._prof = cProfile.Profile()
+            self._prof.enable()
+        t = os.times()
+        self._start_children = t.children_user + t.children_system
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        _active = self
+        return self
+
+    def stop(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+        self._wall = time.perf_counter() - self._start_wall
+        self._cpu = time.process_time() - self._start_cpu
+        t = os.times()
+        self._children_cpu = t.children_user + t.children_system - self._start_children
+        if self._prof is not None:
+            self._prof.disable()
+        if self.trace_memory:
+            import tracemalloc
+
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        path = f"{stack[-1][0]};{name}" if stack else name
+        frame = [path, 0.0]  # path, wall spent in child stages
+        stack.append(frame)
+        w0 = time.perf_counter()
+        c0 = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - w0
+            cpu = time.thread_time() - c0
+            stack.pop()
+            if stack:
+                stack[-1][1] += wall
+            with self._lock:
+                entry = self._stacks.setdefault(path, [0, 0.0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += wall
+                entry[2] += cpu
+                entry[3] += frame[1]
+
+    def report(self) -> Dict:
+        stages: Dict[str, Dict] = {}
+        with self._lock:
+            items = list(self._stacks.items())
+        for path, (count, wall, cpu, _child) in items:
+            leaf = path.rsplit(";", 1)[-1]
+            s = stages.setdefault(leaf, {"count": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            s["count"] += count
+            s["wall_s"] += wall
+            s["cpu_s"] += cpu
+        return {
+            "argv": sys.argv,
+            "wall_s": self._wall,
+            "cpu_s": self._cpu,
+            "children_cpu_s": self._children_cpu,
+            "peak_memory_bytes": self._peak_memory,
+            "stages": stages,
+            "stacks": {
+                path: {"count": c, "wall_s": w, "cpu_s": u}
+                for path, (c, w, u, _child) in items
+            },
+        }
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("a;b;c <self microseconds>") for flamegraph.pl/speedscope."""
+        lines = []
+        with self._lock:
+            items = sorted(self._stacks.items())
+        for path, (_count, wall, _cpu, child) in items:
+            self_us = int(max(wall - child, 0.0) * 1e6)
+            if self_us:
+                lines.append(f"{path} {self_us}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def write(self, prefix: str) -> Dict[str, str]:
+        """Write <prefix>.json, <prefix>.collapsed and (with cProfile) <prefix>.pstats."""
+        d = os.path.dirname(prefix)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        paths = {"json": prefix + ".json", "collapsed": prefix + ".collapsed"}
+        if self._prof is not None:
+            paths["pstats"] = prefix + ".pstats"
+            self._prof.dump_stats(paths["pstats"])
+        rep = self.report()
+        rep["files"] = paths
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return paths
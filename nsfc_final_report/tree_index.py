@@ -0,0 +1,187 @@
+"""Project tree indexer shared by the OCR scripts.
+
+Walks a data root with os.scandir (one listing per directory, directories scanned in
+parallel threads) and returns every project directory together with its sorted
+page_### image list and OCR status (report.txt present, or an unfinished
+report.txt.part from an interrupted run).
+
+A JSON manifest caches each directory's listing keyed by its mtime. Adding,
+removing or renaming an entry updates the directory's mtime, so on a repeat scan an
+unchanged directory costs a single stat() call. The manifest is kept outside the data
+tree (default $XDG_CACHE_HOME/nsfc-final-report/ocr_index/, one file per root) so
+writing it never changes the mtimes it is validated against.
+
+Usage:
+  python -m nsfc_final_report.tree_index /path/to/root_dir [--recursive] [--no-cache]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .fsutil import write_json_atomic
+
+IMAGE_PREFIX = "page_"
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+DEFAULT_OUT_NAME = "report.txt"
+MANIFEST_VERSION = 1
+# listings of directories modified this recently are not trusted on the next scan,
+# since filesystems with coarse mtimes may not show a change made in the same tick
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class Project(NamedTuple):
+    path: str
+    pages: List[str]  # full paths, lexicographic order
+    has_report: bool
+    has_partial: bool
+
+
+def scan_dir(path: str, follow_symlinks: bool = False) -> Dict:
+    """List a directory once and classify its entries.
+
+    follow_symlinks decides whether symlinks to directories count as subdirs.
+    """
+    pages = []
+    subdirs = []
+    names = set()
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            names.add(name)
+            if name.startswith(IMAGE_PREFIX) and name.lower().endswith(IMAGE_EXTS):
+                pages.append(name)
+            elif entry.is_dir(follow_symlinks=follow_symlinks):
+                subdirs.append(name)
+    return {
+        "pages": sorted(pages),
+        "subdirs": sorted(subdirs),
+        "report": DEFAULT_OUT_NAME in names,
+        "partial": DEFAULT_OUT_NAME + ".part" in names,
+        "follow_symlinks": follow_symlinks,
+    }
+
+
+def default_manifest_path(root: str) -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_home, "nsfc-final-report", "ocr_index", digest + ".json")
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict]:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("dirs", {})
+
+
+def save_manifest(manifest_path: str, dirs: Dict[str, Dict]) -> None:
+    try:
+        os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+        write_json_atomic(manifest_path, {"version": MANIFEST_VERSION, "dirs": dirs})
+    except OSError:
+        # unwritable cache dir: the index simply is not cached
+        pass
+
+
+def _index_one(
+    root: str, rel: str, cache: Dict[str, Dict], follow_symlinks: bool = False
+) -> Tuple[str, Optional[Dict]]:
+    path = os.path.join(root, rel) if rel != "." else root
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        cached = cache.get(rel)
+        if (
+            cached is not None
+            and cached.get("mtime_ns") == mtime
+            and cached.get("follow_symlinks", False) == follow_symlinks
+        ):
+            return rel, cached
+        rec = scan_dir(path, follow_symlinks=follow_symlinks)
+    except OSError:
+        return rel, None
+    rec["mtime_ns"] = mtime if time.time_ns() - mtime > RACY_WINDOW_NS else None
+    return rel, rec
+
+
+def index_tree(
+    root: str,
+    recursive: bool = False,
+    workers: int = 8,
+    manifest_path: Optional[str] = None,
+) -> List[Project]:
+    """Return project directories under root, sorted by path.
+
+    Without recursive only the immediate children of root are considered, including
+    symlinks to directories; with recursive every directory (root included) is, and
+    like os.walk symlinked directories are not descended into. manifest_path enables
+    the mtime-validated listing cache; None disables it.
+    """
+    cache = load_manifest(manifest_path) if manifest_path else {}
+    seen: Dict[str, Dict] = {}
+    projects = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        pending = {ex.submit(_index_one, root, ".", cache, not recursive)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                rel, rec = fut.result()
+                if rec is None:
+                    continue
+                seen[rel] = rec
+                path = root if rel == "." else os.path.join(root, rel)
+                if rec["pages"] and (recursive or rel != "."):
+                    projects.append(
+                        Project(
+                            path=path,
+                            pages=[os.path.join(path, p) for p in rec["pages"]],
+                            has_report=rec["report"],
+                            has_partial=rec["partial"],
+                        )
+                    )
+                if recursive or rel == ".":
+                    for name in rec["subdirs"]:
+                        child = name if rel == "." else os.path.join(rel, name)
+                        pending.add(ex.submit(_index_one, root, child, cache))
+    if manifest_path:
+        save_manifest(manifest_path, seen)
+    return sorted(projects, key=lambda p: p.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List NSFC project directories with page counts and OCR status"
+    )
+    parser.add_argument("root", help="root directory containing project subdirectories")
+    parser.add_argument("--recursive", action="store_true", help="search recursively")
+    parser.add_argument(
+        "--workers", type=int, default=8, help="parallel directory scans (default 8)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write the cached listing manifest",
+    )
+    args = parser.parse_args()
+    if not os.path.isdir(args.root):
+        print("Root directory not found:", args.root, file=sys.stderr)
+        sys.exit(2)
+    manifest = None if args.no_cache else default_manifest_path(args.root)
+    for p in index_tree(args.root, args.recursive, args.workers, manifest):
+        status = "done" if p.has_report else ("partial" if p.has_partial else "todo")
+        print(f"{p.path}\t{len(p.pages)}\t{status}")
+
+
+if __name__ == "__main__":
+    main()
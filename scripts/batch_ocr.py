@@ -14,54 +14,54 @@ Options:
   --recursive    Walk the directory tree recursively and process any subdirectory containing page_ images.
   --force        Re-run OCR even if report.txt already exists.
   --lang         tesseract language code (default: leave unspecified). Example for Chinese: chi_sim
+  --jobs N       number of projects to OCR concurrently (default 1)
+  --workers N    parallel directory scans during discovery (default 8)
+  --no-index-cache
+                 do not read or write the cached discovery manifest
+  --profile PREFIX
+                 write per-stage timings (discovery, per-project OCR, child CPU) to PREFIX.json
+                 and PREFIX.collapsed; add --profile-cprofile / --profile-memory for more detail.
+
+Discovery uses nsfc_final_report.tree_index: directories are listed once with os.scandir and the
+listing is cached in a per-root manifest under ~/.cache/nsfc-final-report/, validated by
+directory mtimes, so repeat scans of a large tree only stat() each directory. The page list
+found there is handed to ocr_reports.py (--pages), which then does not list the directory again.
 """
 
 import argparse
 import os
 import subprocess
 import sys
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from nsfc_final_report import tree_index
+from nsfc_final_report.profiling import add_profile_args, profiled, stage
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OCR_SCRIPT = os.path.join(SCRIPT_DIR, "ocr_reports.py")
 
-IMAGE_PREFIX = "page_"
-DEFAULT_OUT_NAME = "report.txt"
+IMAGE_PREFIX = tree_index.IMAGE_PREFIX
+DEFAULT_OUT_NAME = tree_index.DEFAULT_OUT_NAME
 
 
-def is_project_dir(path: str) -> bool:
-    try:
-        for fn in os.listdir(path):
-            if fn.lower().startswith(IMAGE_PREFIX) and fn.lower().endswith(
-                (".png", ".jpg", ".jpeg", ".tif", ".tiff")
-            ):
-                return True
-    except Exception:
-        return False
-    return False
-
-
-def find_project_dirs(root: str, recursive: bool = False) -> List[str]:
-    projects = []
-    if recursive:
-        for dirpath, dirnames, filenames in os.walk(root):
-            if is_project_dir(dirpath):
-                projects.append(dirpath)
-    else:
-        for name in os.listdir(root):
-            full = os.path.join(root, name)
-            if os.path.isdir(full) and is_project_dir(full):
-                projects.append(full)
-    return sorted(projects)
-
-
-def run_ocr(project_dir: str, out_path: str = None, lang: str = None) -> int:
+def run_ocr(
+    project_dir: str,
+    out_path: str = None,
+    lang: str = None,
+    pages: Optional[List[str]] = None,
+) -> int:
     out_path = out_path or os.path.join(project_dir, DEFAULT_OUT_NAME)
     cmd = [sys.executable, OCR_SCRIPT, project_dir, "--out", out_path]
     if lang:
         cmd.extend(["--lang", lang])
+    if pages:
+        # reuse the discovery listing instead of listing the directory again
+        cmd.append("--pages")
+        cmd.extend(os.path.basename(p) for p in pages)
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        with stage("ocr_project"):
+            subprocess.run(cmd, check=True, capture_output=True)
         return 0
     except subprocess.CalledProcessError as e:
         stderr = e.stderr.decode("utf-8", errors="replace") if e.stderr else ""
@@ -79,14 +79,45 @@ def main():
     parser.add_argument(
         "--lang", default=None, help="tesseract language code (e.g. chi_sim)"
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of projects to OCR concurrently (default 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="parallel directory scans during discovery (default 8)",
+    )
+    parser.add_argument(
+        "--no-index-cache",
+        action="store_true",
+        help="do not read or write the cached discovery manifest",
+    )
+    add_profile_args(parser)
     args = parser.parse_args()
 
+    with profiled(args):
+        run_batch(args)
+
+
+def run_batch(args) -> None:
     root = args.root
     if not os.path.isdir(root):
         print("Root directory not found:", root, file=sys.stderr)
         sys.exit(2)
 
-    projects = find_project_dirs(root, recursive=args.recursive)
+    manifest = None if args.no_index_cache else tree_index.default_manifest_path(root)
+    with stage("discover"):
+        projects = tree_index.index_tree(
+            root,
+            recursive=args.recursive,
+            workers=args.workers,
+            manifest_path=manifest,
+        )
     if not projects:
         print("No project directories with page_ images found under", root)
         sys.exit(0)
@@ -95,18 +126,29 @@ def main():
     processed = 0
     skipped = 0
     failed = 0
-    for p in projects:
-        out_path = os.path.join(p, DEFAULT_OUT_NAME)
-        if os.path.exists(out_path) and not args.force:
-            print("Skipping (exists):", p)
+    todo = []
+    for proj in projects:
+        if proj.has_report and not args.force:
+            print("Skipping (exists):", proj.path)
             skipped += 1
             continue
-        print("OCRing:", p)
-        ret = run_ocr(p, out_path=out_path, lang=args.lang)
-        if ret == 0:
-            processed += 1
-        else:
-            failed += 1
+        todo.append(proj)
+
+    def ocr_one(proj: tree_index.Project) -> int:
+        print("OCRing:", proj.path, flush=True)
+        return run_ocr(
+            proj.path,
+            out_path=os.path.join(proj.path, DEFAULT_OUT_NAME),
+            lang=args.lang,
+            pages=proj.pages,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as ex:
+        for ret in ex.map(ocr_one, todo):
+            if ret == 0:
+                processed += 1
+            else:
+                failed += 1
     print(f"Done. processed={processed}, skipped={skipped}, failed={failed}")
 
 
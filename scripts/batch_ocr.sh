@@ -49,7 +49,10 @@ fi
 
 # Find candidate project directories
 mapfile -t PROJECT_DIRS < <( 
-  if [ "$RECURSIVE" -eq 1 ]; then
+  if [ "$RECURSIVE" -eq 1 ] && python3 -c "import nsfc_final_report.tree_index" >/dev/null 2>&1; then
+    # shared scandir indexer (listing cached under ~/.cache); prints path<TAB>pages<TAB>status
+    python3 -m nsfc_final_report.tree_index --recursive "$ROOT" | cut -f1
+  elif [ "$RECURSIVE" -eq 1 ]; then
     # find any directory containing a page_ file
     find "$ROOT" -type f \( -iname 'page_*.png' -o -iname 'page_*.jpg' -o -iname 'page_*.jpeg' -o -iname 'page_*.tif' -o -iname 'page_*.tiff' \) -print0 | xargs -0 -n1 dirname | sort -u
   else
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+OCR throughput benchmark for nsfc-final-report
+
+Runs ocr_reports.ocr_dir (in-process, one thread per job) and batch_ocr.py (as a
+subprocess with --jobs) over a corpus from make_ocr_corpus.py at several job counts and
+reports pages/second, CPU time, peak memory and a character accuracy score against the
+corpus truth.json, so speed-ups can be checked for quality loss.
+
+Every run happens in its own interpreter on a fresh copy of the corpus, so peak RSS
+and CPU time cover that run only and existing report.txt files never cause pages to
+be skipped.
+
+Usage:
+  python scripts/make_ocr_corpus.py /tmp/ocr_corpus
+  python scripts/bench_ocr.py /tmp/ocr_corpus --jobs 1,2,4 --lang chi_sim+eng --out bench.json
+
+Accuracy is 1 - edit_distance / truth_chars with all whitespace removed (tesseract
+inserts spaces between CJK characters). Requires tesseract in PATH.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from nsfc_final_report import tree_index
+
+BENCH_SCRIPT = os.path.abspath(__file__)
+SCRIPT_DIR = os.path.dirname(BENCH_SCRIPT)
+BATCH_SCRIPT = os.path.join(SCRIPT_DIR, "batch_ocr.py")
+OCR_SCRIPT = os.path.join(SCRIPT_DIR, "ocr_reports.py")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PAGE_MARKER = re.compile(r"\n\n----- PAGE: (\S+) -----\n\n")
+_WS = re.compile(r"\s+")
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (insert/delete/substitute cost 1)."""
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def split_report(text: str) -> Dict[str, str]:
+    """Map page file name -> OCR text from a combined report.txt."""
+    parts = PAGE_MARKER.split(text)
+    # parts = [header, name1, text1, name2, text2, ...]
+    return {parts[i]: parts[i + 1] for i in range(1, len(parts) - 1, 2)}
+
+
+def score_reports(root: str, truth: Dict[str, str]) -> Dict:
+    """Compare <root>/<project>/report.txt against truth; returns accuracy figures."""
+    errors = 0
+    chars = 0
+    missing = 0
+    by_project: Dict[str, Dict[str, str]] = {}
+    for key in truth:
+        project = key.split("/", 1)[0]
+        if project in by_project:
+            continue
+        try:
+            with open(
+                os.path.join(root, project, tree_index.DEFAULT_OUT_NAME),
+                "r",
+                encoding="utf-8",
+            ) as f:
+                by_project[project] = split_report(f.read())
+        except OSError:
+            by_project[project] = {}
+    for key, expected in truth.items():
+        project, name = key.split("/", 1)
+        got = by_project[project].get(name)
+        if got is None:
+            missing += 1
+            got = ""
+        expected = _WS.sub("", expected)
+        got = _WS.sub("", got)
+        errors += edit_distance(expected, got)
+        chars += len(expected)
+    return {
+        "char_accuracy": max(0.0, 1.0 - errors / chars) if chars else None,
+        "char_errors": errors,
+        "truth_chars": chars,
+        "missing_pages": missing,
+    }
+
+
+def _usage() -> Tuple[float, Optional[int], Optional[int]]:
+    """(CPU seconds, own peak RSS KiB, largest child's peak RSS KiB) of this process.
+
+    CPU covers this process and its reaped children (tesseract, batch_ocr.py).
+    """
+    if resource is None:
+        t = os.times()
+        return t.user + t.system + t.children_user + t.children_system, None, None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    scale = 1024 if sys.platform == "darwin" else 1
+    cpu = own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+    return cpu, own.ru_maxrss // scale, kids.ru_maxrss // scale
+
+
+def _load_ocr_reports():
+    # load the sibling script as a module without touching sys.path
+    spec = importlib.util.spec_from_file_location("ocr_reports", OCR_SCRIPT)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def run_ocr_dir(root: str, jobs: int, lang: Optional[str]) -> None:
+    ocr_reports = _load_ocr_reports()
+    projects = tree_index.index_tree(root)
+
+    def one(p):
+        ocr_reports.ocr_dir(
+            p.path,
+            os.path.join(p.path, tree_index.DEFAULT_OUT_NAME),
+            lang=lang,
+            pages=p.pages,
+        )
+
+    with ThreadPoolExecutor(max_workers=jobs) as ex:
+        list(ex.map(one, projects))
+
+
+def run_batch(root: str, jobs: int, lang: Optional[str]) -> None:
+    cmd = [sys.executable, BATCH_SCRIPT, root, "--force", "--no-index-cache"]
+    cmd += ["--jobs", str(jobs)]
+    if lang:
+        cmd += ["--lang", lang]
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+RUNNERS = {"ocr_dir": run_ocr_dir, "batch": run_batch}
+
+
+def measure_one(
+    corpus: str, truth: Dict[str, str], mode: str, jobs: int, lang: Optional[str]
+) -> Dict:
+    """Time one run in this process; meant to be called in a fresh interpreter."""
+    with tempfile.TemporaryDirectory(prefix="nsfc-ocr-bench-") as tmp:
+        root = os.path.join(tmp, "corpus")
+        shutil.copytree(corpus, root)
+        cpu0, _, _ = _usage()
+        wall0 = time.perf_counter()
+        RUNNERS[mode](root, jobs, lang)
+        wall = time.perf_counter() - wall0
+        cpu1, peak_kib, peak_child_kib = _usage()
+        result = {
+            "mode": mode,
+            "jobs": jobs,
+            "pages": len(truth),
+            "wall_s": wall,
+            "pages_per_s": len(truth) / wall if wall > 0 else None,
+            "cpu_s": cpu1 - cpu0,
+            "cpu_utilisation": (cpu1 - cpu0) / wall if wall else None,
+            # peak RSS of the benchmark process (ocr_dir threads, page buffers)
+            "peak_rss_kib": peak_kib,
+            # peak RSS of the largest child of this run (tesseract or batch_ocr.py)
+            "peak_child_rss_kib": peak_child_kib,
+        }
+        result.update(score_reports(root, truth))
+        return result
+
+
+def bench_one(
+    corpus: str,
+    mode: str,
+    jobs: int,
+    lang: Optional[str],
+    omp_thread_limit: Optional[int],
+) -> Dict:
+    """Run measure_one in a new interpreter so rusage figures belong to this run only."""
+    env = dict(os.environ)
+    if omp_thread_limit:
+        # keep tesseract's own OpenMP threads from competing with our jobs
+        env["OMP_THREAD_LIMIT"] = str(omp_thread_limit)
+    cmd = [sys.executable, BENCH_SCRIPT, corpus, "--one", f"{mode}:{jobs}"]
+    if lang:
+        cmd += ["--lang", lang]
+    proc = subprocess.run(cmd, env=env, check=True, stdout=subprocess.PIPE, text=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR throughput and accuracy on a synthetic corpus"
+    )
+    parser.add_argument("corpus", help="directory written by make_ocr_corpus.py")
+    parser.add_argument(
+        "--jobs", default="1,2,4", help="comma separated job counts (default 1,2,4)"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["ocr_dir", "batch", "both"],
+        default="both",
+        help="which entry point to benchmark",
+    )
+    parser.add_argument("--lang", default=None, help="tesseract language (chi_sim+eng)")
+    parser.add_argument(
+        "--omp-thread-limit",
+        type=int,
+        default=None,
+        help="set OMP_THREAD_LIMIT for tesseract (1 is usual when jobs > 1)",
+    )
+    parser.add_argument("--out", default=None, help="write results as JSON here")
+    # internal: run a single MODE:JOBS measurement and print it as JSON
+    parser.add_argument("--one", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    truth_path = os.path.join(args.corpus, "truth.json")
+    if not os.path.exists(truth_path):
+        print("truth.json not found in", args.corpus, file=sys.stderr)
+        sys.exit(2)
+    if shutil.which("tesseract") is None:
+        print("tesseract not found in PATH", file=sys.stderr)
+        sys.exit(2)
+    with open(truth_path, "r", encoding="utf-8") as f:
+        truth = json.load(f)
+    if args.one:
+        mode, jobs = args.one.split(":")
+        print(json.dumps(measure_one(args.corpus, truth, mode, int(jobs), args.lang)))
+        return
+
+    modes = ["ocr_dir", "batch"] if args.mode == "both" else [args.mode]
+    results: List[Dict] = []
+    for mode in modes:
+        for jobs in [int(j) for j in args.jobs.split(",") if j.strip()]:
+            r = bench_one(args.corpus, mode, jobs, args.lang, args.omp_thread_limit)
+            results.append(r)
+            acc = r["char_accuracy"]
+            print(
+                f"{mode:8s} jobs={jobs:<3d} {r['pages_per_s']:.2f} pages/s  "
+                f"cpu={r['cpu_s']:.1f}s ({r['cpu_utilisation']:.2f}x)  "
+                f"peak_rss={r['peak_rss_kib']}KiB child={r['peak_child_rss_kib']}KiB  "
+                f"accuracy={'n/a' if acc is None else f'{acc:.4f}'}",
+                flush=True,
+            )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,23 +9,26 @@ Requires tesseract binary available in PATH. This script will:
 - find image files in the project directory named like page_###.png/jpg
 - run tesseract on each page and collect text
 - save combined text to the output file (UTF-8)
+
+Pages are appended to <out>.part as they finish, with progress tracked in
+<out>.progress.json, so an interrupted run resumes from the first unfinished page.
 """
 
 import argparse
+import json
 import os
 import subprocess
 import sys
-from typing import List
+from typing import Dict, List, Optional
+
+from nsfc_final_report import fsutil, tree_index
+from nsfc_final_report.profiling import add_profile_args, profiled, stage
 
-IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+IMAGE_EXTS = tree_index.IMAGE_EXTS
 
 
 def find_pages(project_dir: str) -> List[str]:
-    files = os.listdir(project_dir)
-    pages = [
-        f for f in files if f.lower().endswith(IMAGE_EXTS) and f.startswith("page_")
-    ]
-    pages_sorted = sorted(pages)
+    pages_sorted = tree_index.scan_dir(project_dir)["pages"]
     return [os.path.join(project_dir, p) for p in pages_sorted]
 
 
@@ -36,7 +39,8 @@ def ocr_image_to_text(image_path: str, lang: str = None) -> str:
         cmd.insert(2, "-l")
         cmd.insert(3, lang)
     try:
-        proc = subprocess.run(cmd, capture_output=True, check=True)
+        with stage("tesseract"):
+            proc = subprocess.run(cmd, capture_output=True, check=True)
         text = proc.stdout.decode("utf-8", errors="replace")
         return text
     except subprocess.CalledProcessError as e:
@@ -47,22 +51,90 @@ def ocr_image_to_text(image_path: str, lang: str = None) -> str:
         raise RuntimeError("tesseract not found in PATH; please install tesseract-ocr")
 
 
+def _progress_path(out_path: str) -> str:
+    return out_path + ".progress.json"
+
+
+def _load_progress(progress_path: str) -> Optional[Dict]:
+    try:
+        with open(progress_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_progress(progress_path: str, state: Dict) -> None:
+    fsutil.write_json_atomic(progress_path, state, ensure_ascii=False)
+
+
 def ocr_dir(
-    project_dir: str, out_path: str, header: str = None, lang: str = None
+    project_dir: str,
+    out_path: str,
+    header: str = None,
+    lang: str = None,
+    pages: Optional[List[str]] = None,
 ) -> None:
-    pages = find_pages(project_dir)
+    """OCR every page of a project directory into out_path.
+
+    pages is the ordered list of page image paths when the caller has already listed
+    the directory (batch_ocr.py passes the tree index's listing); otherwise the
+    directory is scanned with find_pages.
+
+    Each page's text is appended to <out_path>.part as soon as it is recognised and
+    a small <out_path>.progress.json sidecar records how many pages are done, the
+    byte offset of the part file at that point and a hash of the last page written.
+    If a previous run was interrupted with the same pages, header and lang and the
+    part file still ends with that page, OCR resumes from the first unfinished page.
+    On completion the part file is atomically renamed to out_path.
+    """
+    if pages is None:
+        with stage("find_pages"):
+            pages = find_pages(project_dir)
     if not pages:
         raise ValueError(f"No page images found in {project_dir}")
-    parts: List[str] = []
-    if header:
-        parts.append(header)
-    for p in pages:
-        parts.append(f"\n\n----- PAGE: {os.path.basename(p)} -----\n\n")
-        txt = ocr_image_to_text(p, lang=lang)
-        parts.append(txt)
-    combined = "".join(parts)
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(combined)
+    part_path = out_path + ".part"
+    progress_path = _progress_path(out_path)
+    names = [os.path.basename(p) for p in pages]
+    state = {"pages": names, "header": header, "lang": lang, "done": 0, "offset": 0}
+
+    prev = _load_progress(progress_path)
+    if (
+        prev
+        and prev.get("pages") == names
+        and prev.get("header") == header
+        and prev.get("lang") == lang
+        and fsutil.tail_matches(part_path, prev)
+    ):
+        state["done"] = prev.get("done", 0)
+        state["offset"] = prev["offset"]
+        state["tail_start"] = prev["tail_start"]
+        state["tail_sha1"] = prev["tail_sha1"]
+
+    mode = "r+b" if state["done"] else "wb"
+    with open(part_path, mode) as f:
+        # drop anything written after the last recorded page (e.g. a half-written page)
+        f.seek(state["offset"])
+        f.truncate()
+        if not state["done"] and header:
+            f.write(header.encode("utf-8"))
+            f.flush()
+            state["offset"] = f.tell()
+        for idx in range(state["done"], len(pages)):
+            p = pages[idx]
+            txt = ocr_image_to_text(p, lang=lang)
+            with stage("disk_write"):
+                chunk = f"\n\n----- PAGE: {names[idx]} -----\n\n{txt}".encode("utf-8")
+                f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+                state["done"] = idx + 1
+                state.update(fsutil.tail_state(f.tell(), chunk))
+                _save_progress(progress_path, state)
+    os.replace(part_path, out_path)
+    try:
+        os.remove(progress_path)
+    except FileNotFoundError:
+        pass
 
 
 def main():
@@ -87,6 +159,14 @@ def main():
         default=None,
         help="tesseract language code to pass as -l (e.g. chi_sim)",
     )
+    parser.add_argument(
+        "--pages",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help="page file names in order, instead of listing project_dir",
+    )
+    add_profile_args(parser)
     args = parser.parse_args()
     lang = args.lang
     project_dir = args.project_dir
@@ -95,7 +175,11 @@ def main():
         sys.exit(2)
     out_path = args.out or os.path.join(project_dir, "report.txt")
     try:
-        ocr_dir(project_dir, out_path, header=args.header, lang=lang)
+        with profiled(args):
+            pages = None
+            if args.pages:
+                pages = [os.path.join(project_dir, name) for name in args.pages]
+            ocr_dir(project_dir, out_path, header=args.header, lang=lang, pages=pages)
         print("Wrote combined OCR text to", out_path)
     except Exception as e:
         print("Error:", e, file=sys.stderr)
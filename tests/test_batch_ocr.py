@@ -0,0 +1,15 @@
+import runpy
+
+
+def test_run_ocr_passes_indexed_pages(monkeypatch, tmp_path):
+    mod = runpy.run_path("scripts/batch_ocr.py")
+    captured = {}
+
+    def fake_run(cmd, check=True, capture_output=True):
+        captured["cmd"] = cmd
+
+    monkeypatch.setattr(mod["subprocess"], "run", fake_run)
+    pages = [str(tmp_path / "page_001.png"), str(tmp_path / "page_002.jpg")]
+    assert mod["run_ocr"](str(tmp_path), lang="chi_sim", pages=pages) == 0
+    cmd = captured["cmd"]
+    assert cmd[cmd.index("--pages") + 1 :] == ["page_001.png", "page_002.jpg"]
@@ -0,0 +1,95 @@
+import json
+import os
+import runpy
+
+import pytest
+
+
+def test_edit_distance_and_split_report():
+    mod = runpy.run_path("scripts/bench_ocr.py")
+    assert mod["edit_distance"]("kitten", "sitting") == 3
+    assert mod["edit_distance"]("", "abc") == 3
+    assert mod["edit_distance"]("心肌缺血", "心肌缺血") == 0
+
+    report = (
+        "HDR\n\n----- PAGE: page_001.png -----\n\nfirst\n"
+        "\n\n----- PAGE: page_002.jpg -----\n\nsecond\n"
+    )
+    assert mod["split_report"](report) == {
+        "page_001.png": "first\n",
+        "page_002.jpg": "second\n",
+    }
+
+
+def test_score_reports_ignores_whitespace_and_counts_missing(tmp_path):
+    mod = runpy.run_path("scripts/bench_ocr.py")
+    (tmp_path / "P1").mkdir()
+    (tmp_path / "P1" / "report.txt").write_text(
+        "\n\n----- PAGE: page_001.png -----\n\n心 肌 缺 血\n"
+        "\n\n----- PAGE: page_002.png -----\n\nabxd\n",
+        encoding="utf-8",
+    )
+    truth = {
+        "P1/page_001.png": "心肌缺血",
+        "P1/page_002.png": "abcd",
+        "P1/page_003.png": "",
+        "P2/page_001.png": "zz",
+    }
+    score = mod["score_reports"](str(tmp_path), truth)
+    assert score["truth_chars"] == 10
+    assert score["char_errors"] == 3
+    assert score["missing_pages"] == 2
+    assert score["char_accuracy"] == pytest.approx(0.7)
+
+
+def test_make_corpus_layout(tmp_path):
+    pytest.importorskip("PIL")
+    mod = runpy.run_path("scripts/make_ocr_corpus.py")
+    out = str(tmp_path / "corpus")
+    truth = mod["make_corpus"](out, projects=2, pages=3, dpi=40, blank_ratio=0.0)
+    assert len(truth) == 6
+    with open(os.path.join(out, "truth.json"), encoding="utf-8") as f:
+        assert json.load(f) == truth
+    exts = set()
+    for key in truth:
+        path = os.path.join(out, key)
+        assert os.path.exists(path)
+        exts.add(os.path.splitext(path)[1])
+    assert exts == {".png", ".jpg"}
+    first = sorted(truth)[0]
+    assert truth[first]
+
+
+def test_measure_one_reports_per_run_usage(tmp_path):
+    mod = runpy.run_path("scripts/bench_ocr.py")
+    (tmp_path / "P1").mkdir()
+    truth = {"P1/page_001.png": "abc"}
+
+    def fake_runner(root, jobs, lang):
+        with open(os.path.join(root, "P1", "report.txt"), "w", encoding="utf-8") as f:
+            f.write("\n\n----- PAGE: page_001.png -----\n\nabc\n")
+
+    mod["RUNNERS"]["fake"] = fake_runner
+    r = mod["measure_one"](str(tmp_path), truth, "fake", 2, None)
+    assert r["mode"] == "fake" and r["jobs"] == 2 and r["pages"] == 1
+    assert r["char_accuracy"] == 1.0
+    assert r["cpu_s"] >= 0
+    if mod["resource"] is not None:
+        assert r["peak_rss_kib"] > 0
+    # the benchmark works on a copy of the corpus
+    assert not (tmp_path / "P1" / "report.txt").exists()
+
+
+def test_make_corpus_rejects_unknown_formats(monkeypatch, tmp_path, capsys):
+    mod = runpy.run_path("scripts/make_ocr_corpus.py")
+    assert mod["_formats"]("png, JPG") == ["png", "jpg"]
+    with pytest.raises(ValueError):
+        mod["make_corpus"](str(tmp_path), formats=["jpeg"])
+    monkeypatch.setattr(
+        "sys.argv", ["make_ocr_corpus.py", str(tmp_path), "--formats", "png,jpeg"]
+    )
+    with pytest.raises(SystemExit) as exc:
+        mod["main"]()
+    assert exc.value.code == 2
+    assert "--formats" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
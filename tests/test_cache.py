@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from nsfc_final_report.cache import LookupCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hits_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = LookupCache(maxsize=2, ttl=10, clock=clock)
+    loads = []
+
+    def loader(k):
+        return lambda: loads.append(k) or k.upper()
+
+    assert cache.get("a", loader("a")) == "A"
+    assert cache.get("a", loader("a")) == "A"
+    assert loads == ["a"]
+
+    cache.get("b", loader("b"))
+    cache.get("a", loader("a"))  # a is now most recently used
+    cache.get("c", loader("c"))  # evicts b
+    cache.get("b", loader("b"))
+    assert loads == ["a", "b", "c", "b"]
+
+    clock.now = 11
+    cache.get("b", loader("b"))
+    assert loads[-1] == "b" and len(loads) == 5
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 5
+    assert stats["evictions"] == 2 and stats["size"] == 2
+
+
+def test_errors_are_not_cached():
+    cache = LookupCache()
+
+    def boom():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        cache.get("k", boom)
+    assert cache.get("k", lambda: 1) == 1
+
+
+def test_concurrent_identical_lookups_are_coalesced():
+    cache = LookupCache(maxsize=0)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "v"
+
+    results = []
+
+    def worker():
+        results.append(cache.get("k", slow))
+
+    first = threading.Thread(target=worker)
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=worker) for _ in range(4)]
+    for t in others:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in [first] + others:
+        t.join(5)
+    assert results == ["v"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_uncacheable_values_are_reloaded():
+    cache = LookupCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return None if len(loads) == 1 else "ok"
+
+    def ok(v):
+        return v is not None
+
+    assert cache.get("k", loader, cacheable=ok) is None
+    assert cache.get("k", loader, cacheable=ok) == "ok"
+    assert cache.get("k", loader, cacheable=ok) == "ok"
+    assert len(loads) == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_failing_cacheable_predicate_releases_waiters():
+    cache = LookupCache()
+
+    def bad(v):
+        raise ValueError("bad predicate")
+
+    with pytest.raises(ValueError):
+        cache.get("k", lambda: 1, cacheable=bad)
+    # the key is not left in flight: a later call loads instead of blocking
+    assert not cache._inflight
+    assert cache.get("k", lambda: 2) == 2
@@ -1,7 +1,9 @@
 import base64
 import json
 import os
+import re
 
+import pytest
 from Crypto.Cipher import DES
 
 import nsfc_final_report.client as client_mod
@@ -139,3 +141,328 @@ def test_download_report_retry_on_transient_error(monkeypatch, tmp_path):
     files = c.download_report("P456", out_dir=out_dir, max_pages=3, force=True)
     assert len(files) == 1
     assert calls["n"] >= 2
+
+
+def test_load_job_spec_jsonl_and_array(tmp_path):
+    spec = tmp_path / "jobs.jsonl"
+    spec.write_text(
+        '{"name": "a", "keyword": "x", "code": "H02"}\n\n{"fuzzyKeyword": "y"}\n',
+        encoding="utf-8",
+    )
+    queries = client_mod.load_job_spec(str(spec))
+    assert queries == [
+        {"name": "a", "keyword": "x", "code": "H02"},
+        {"name": "query_1", "keyword": "y"},
+    ]
+    arr = tmp_path / "jobs.json"
+    arr.write_text(json.dumps([{"keyword": "z"}]), encoding="utf-8")
+    assert client_mod.load_job_spec(str(arr)) == [{"keyword": "z", "name": "query_0"}]
+
+
+@pytest.mark.parametrize(
+    "entries, message",
+    [
+        ([{"name": "a", "conclusion_year": "2020"}], "unknown key(s) conclusion_year"),
+        ([{"name": "a", "pageNum": 3}], "pageNum cannot be set"),
+        ([{"name": "a"}, {"name": "a", "code": "H02"}], "duplicate name 'a'"),
+    ],
+)
+def test_load_job_spec_rejects_bad_entries(tmp_path, entries, message):
+    spec = tmp_path / "jobs.json"
+    spec.write_text(json.dumps(entries), encoding="utf-8")
+    with pytest.raises(ValueError, match=re.escape(message)):
+        client_mod.load_job_spec(str(spec))
+
+
+def test_batch_fetch_jobs_dedupes_projects(monkeypatch, tmp_path):
+    c = client_mod.NSFCClient()
+    results = {"x": [["P1", "t1"], ["P2", "t2"]], "y": [["P2", "t2"], ["P3", "t3"]]}
+    searched = []
+
+    def fake_search(self, fuzzyKeyword="", pageNum=0, pageSize=10, **kwargs):
+        if pageNum == 0:
+            searched.append((fuzzyKeyword, kwargs))
+        rows = results[fuzzyKeyword] if pageNum == 0 else []
+        return {"data": {"resultsData": rows, "itotalRecords": len(rows)}}
+
+    fetched = []
+
+    def fake_fetch_project(self, pid, pdir, force=False):
+        fetched.append(pid)
+        os.makedirs(pdir, exist_ok=True)
+
+    monkeypatch.setattr(client_mod.NSFCClient, "search", fake_search)
+    monkeypatch.setattr(client_mod.NSFCClient, "_fetch_project", fake_fetch_project)
+
+    queries = [
+        {"name": "qa", "keyword": "x", "conclusionYear": "2020"},
+        {"name": "qb", "keyword": "y", "code": "H02"},
+    ]
+    processed = c.batch_fetch_jobs(queries, out_dir=str(tmp_path))
+    assert processed == ["P1", "P2", "P3"]
+    assert fetched == ["P1", "P2", "P3"]
+    assert searched == [("x", {"conclusionYear": "2020"}), ("y", {"code": "H02"})]
+    with open(tmp_path / "project_queries.json", encoding="utf-8") as f:
+        assert json.load(f) == {"P1": ["qa"], "P2": ["qa", "qb"], "P3": ["qb"]}
+    with open(tmp_path / "P2" / "queries.json", encoding="utf-8") as f:
+        assert json.load(f) == ["qa", "qb"]
+    lines = (tmp_path / "search_results.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+
+
+def test_batch_fetch_jobs_resumes_failed_query(monkeypatch, tmp_path):
+    pages = {"x": [[["P1"], ["P2"]]], "y": [[["P2"], ["P3"]], [["P4"]]]}
+    search = _flaky_search(monkeypatch, pages, fail=("y", 1))
+    c = client_mod.NSFCClient()
+    queries = [{"name": "qa", "keyword": "x"}, {"name": "qb", "keyword": "y"}]
+    jsonl = tmp_path / "rows.jsonl"
+    with pytest.raises(RuntimeError):
+        c.batch_fetch_jobs(
+            queries, out_dir=str(tmp_path), pageSize=2, jsonl_path=str(jsonl)
+        )
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 4
+
+    search["fail"] = None
+    search["calls"].clear()
+    processed = c.batch_fetch_jobs(
+        queries, out_dir=str(tmp_path), pageSize=2, jsonl_path=str(jsonl)
+    )
+    # query x and the first page of y are not searched again
+    assert search["calls"] == [("y", 1)]
+    assert processed == ["P1", "P2", "P3", "P4"]
+    with open(tmp_path / "project_queries.json", encoding="utf-8") as f:
+        assert json.load(f)["P2"] == ["qa", "qb"]
+
+    # a finished run starts over
+    search["calls"].clear()
+    c.batch_fetch_jobs(
+        queries, out_dir=str(tmp_path), pageSize=2, jsonl_path=str(jsonl)
+    )
+    assert search["calls"][0] == ("x", 0)
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_cli_batch_rejects_keyword_with_jobs(monkeypatch, tmp_path, capsys):
+    import nsfc_final_report.cli as cli
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["nsfc-final-report", "batch", "--jobs", str(tmp_path / "jobs.jsonl")]
+        + ["-k", "x"],
+    )
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 2
+    assert "--keyword cannot be used with --jobs" in capsys.readouterr().err
+
+
+def _fake_pages(pages, total):
+    def fake_search(self, fuzzyKeyword="", pageNum=0, pageSize=10, **kwargs):
+        rows = pages[pageNum] if pageNum < len(pages) else []
+        return {"data": {"resultsData": rows, "itotalRecords": total}}
+
+    return fake_search
+
+
+def _flaky_search(monkeypatch, pages, fail):
+    """Serve pages from NSFCClient.search, raising RuntimeError("down") at `fail`.
+
+    pages is a list of pages, or a dict of keyword -> pages; fail is a pageNum, or a
+    (keyword, pageNum) pair for dict pages. Backoff sleeps and project fetches are
+    stubbed out. Returns {"fail", "calls"}: set "fail" to None to let the next run
+    through; "calls" records every (keyword, pageNum) searched.
+    """
+    state = {"fail": fail, "calls": []}
+
+    def flaky_search(self, fuzzyKeyword="", pageNum=0, pageSize=10, **kwargs):
+        state["calls"].append((fuzzyKeyword, pageNum))
+        by_keyword = isinstance(pages, dict)
+        key = (fuzzyKeyword, pageNum) if by_keyword else pageNum
+        if key == state["fail"]:
+            raise RuntimeError("down")
+        kw_pages = pages[fuzzyKeyword] if by_keyword else pages
+        total = sum(len(page) for page in kw_pages)
+        return _fake_pages(kw_pages, total)(self, fuzzyKeyword, pageNum, pageSize)
+
+    monkeypatch.setattr(client_mod.NSFCClient, "search", flaky_search)
+    monkeypatch.setattr(client_mod, "_backoff", lambda s: None)
+    monkeypatch.setattr(
+        client_mod.NSFCClient, "_fetch_project", lambda self, pid, pdir, force: None
+    )
+    return state
+
+
+def test_search_all_prefetch_matches_sync(monkeypatch):
+    pages = [[["P1"], ["P2"]], [["P3"], ["P4"]], [["P5"]]]
+    monkeypatch.setattr(client_mod.NSFCClient, "search", _fake_pages(pages, 5))
+    c = client_mod.NSFCClient()
+    sync = list(c.search_all(pageSize=2, prefetch=0))
+    ahead = list(c.search_all(pageSize=2, prefetch=2))
+    assert sync == ahead == [["P1"], ["P2"], ["P3"], ["P4"], ["P5"]]
+
+
+def test_read_ahead_propagates_errors_and_stops_early():
+    def gen():
+        yield 1
+        yield 2
+        raise ValueError("boom")
+
+    it = client_mod._read_ahead(gen(), 1)
+    assert next(it) == 1
+    assert next(it) == 2
+    with pytest.raises(ValueError, match="boom"):
+        next(it)
+
+    produced = []
+
+    def endless():
+        n = 0
+        while True:
+            produced.append(n)
+            yield n
+            n += 1
+
+    it = client_mod._read_ahead(endless(), 2)
+    assert next(it) == 0
+    it.close()
+    # producer is bounded by the buffer and stops once the consumer closes
+    assert len(produced) <= 10
+
+
+def test_cli_search_all_jsonl(monkeypatch, capsys):
+    import nsfc_final_report.cli as cli
+
+    pages = [[["P1", "a"]], [["P2", "b"]]]
+    monkeypatch.setattr(client_mod.NSFCClient, "search", _fake_pages(pages, 2))
+    monkeypatch.setattr(
+        "sys.argv",
+        ["nsfc-final-report", "search", "-k", "x", "--size", "1", "--all"]
+        + ["--format", "jsonl"],
+    )
+    cli.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"project_id": "P1", "raw": ["P1", "a"]},
+        {"project_id": "P2", "raw": ["P2", "b"]},
+    ]
+
+
+def test_search_all_checkpoint_resumes_after_failure(monkeypatch, tmp_path):
+    pages = [[["P1"], ["P2"]], [["P3"], ["P4"]], [["P5"]]]
+    search = _flaky_search(monkeypatch, pages, fail=2)
+    c = client_mod.NSFCClient()
+    ckpt = str(tmp_path / "cursor.json")
+
+    got = []
+    with pytest.raises(RuntimeError):
+        for row in c.search_all("x", pageSize=2, prefetch=0, checkpoint_path=ckpt):
+            got.append(row)
+    assert got == [["P1"], ["P2"], ["P3"], ["P4"]]
+    with open(ckpt, encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["next_page"] == 2 and state["rows"] == 4
+    assert state["itotalRecords"] == 5 and not state["done"]
+
+    search["fail"] = None
+    search["calls"].clear()
+    rest = list(c.search_all("x", pageSize=2, checkpoint_path=ckpt))
+    assert rest == [["P5"]]
+    assert search["calls"] == [("x", 2)]
+    # finished harvest searches again from page 0; so does a different query
+    search["calls"].clear()
+    assert len(list(c.search_all("x", pageSize=2, checkpoint_path=ckpt))) == 5
+    assert search["calls"][0] == ("x", 0)
+    assert len(list(c.search_all("y", pageSize=2, checkpoint_path=ckpt))) == 5
+
+
+def test_batch_fetch_resume_appends_without_duplicates(monkeypatch, tmp_path):
+    pages = [[["P1"], ["P2"]], [["P3"], ["P4"]], [["P5"]]]
+    search = _flaky_search(monkeypatch, pages, fail=1)
+    c = client_mod.NSFCClient()
+    out = str(tmp_path)
+    jsonl = tmp_path / "search_results.jsonl"
+
+    with pytest.raises(RuntimeError):
+        c.batch_fetch("x", out_dir=out, pageSize=2)
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 2
+    # simulate a half-written row after the last checkpoint
+    with open(jsonl, "a", encoding="utf-8") as f:
+        f.write('{"project_id": "P3", "ra')
+
+    search["fail"] = None
+    processed = c.batch_fetch("x", out_dir=out, pageSize=2)
+    assert processed == ["P1", "P2", "P3", "P4", "P5"]
+    ids = [
+        json.loads(line)["project_id"] for line in jsonl.read_text("utf-8").splitlines()
+    ]
+    assert ids == ["P1", "P2", "P3", "P4", "P5"]
+
+    # completed harvest: rerun searches again and rewrites the results
+    search["calls"].clear()
+    processed = c.batch_fetch("x", out_dir=out, pageSize=2)
+    assert search["calls"][0] == ("x", 0)
+    assert processed == ["P1", "P2", "P3", "P4", "P5"]
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 5
+
+    # restart ignores the checkpoint and rewrites the results
+    processed = c.batch_fetch("x", out_dir=out, pageSize=2, resume=False)
+    assert len(jsonl.read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_batch_fetch_does_not_resume_into_a_different_jsonl(monkeypatch, tmp_path):
+    pages = [[["P1"], ["P2"]], [["P3"], ["P4"]], [["P5"]]]
+    search = _flaky_search(monkeypatch, pages, fail=1)
+    c = client_mod.NSFCClient()
+    jsonl = tmp_path / "search_results.jsonl"
+    with pytest.raises(RuntimeError):
+        c.batch_fetch("x", out_dir=str(tmp_path), pageSize=2)
+    # another run overwrote the jsonl with different rows, at least as long
+    jsonl.write_text(
+        "".join(
+            json.dumps({"project_id": f"Q{i}", "raw": [f"Q{i}"]}) + "\n"
+            for i in range(3)
+        ),
+        encoding="utf-8",
+    )
+
+    search["fail"] = None
+    processed = c.batch_fetch("x", out_dir=str(tmp_path), pageSize=2)
+    assert processed == ["P1", "P2", "P3", "P4", "P5"]
+
+
+def test_lookups_are_cached(monkeypatch):
+    c = client_mod.NSFCClient()
+    posts = []
+
+    def fake_post(url, data=None, headers=None, timeout=None):
+        posts.append(url)
+        if "completeProjectReport" in url:
+            return DummyResp(json_obj={"code": 200, "data": {"url": "/img/1.png"}})
+        return DummyResp(json_obj={"data": {"id": "P1"}})
+
+    monkeypatch.setattr(c.session, "post", fake_post)
+    assert c.get_project_info("P1") == c.get_project_info("P1")
+    assert c.get_report_page_url("P1", 1) == c.get_report_page_url("P1", 1)
+    assert c.get_report_page_url("P1", 1).endswith("/img/1.png")
+    assert len(posts) == 2
+    stats = c.cache_stats()
+    assert stats["misses"] == 2 and stats["hits"] == 3
+
+
+def test_failed_page_url_lookup_is_retried(monkeypatch):
+    c = client_mod.NSFCClient()
+    answers = [
+        {"code": 500, "message": "busy"},
+        {"code": 200, "data": {"url": "/img/1.png"}},
+    ]
+    posts = []
+
+    def fake_post(url, data=None, headers=None, timeout=None):
+        posts.append(url)
+        return DummyResp(json_obj=answers[min(len(posts), len(answers)) - 1])
+
+    monkeypatch.setattr(c.session, "post", fake_post)
+    assert c.get_report_page_url("P1", 1) is None
+    assert c.get_report_page_url("P1", 1).endswith("/img/1.png")
+    assert c.get_report_page_url("P1", 1).endswith("/img/1.png")
+    assert len(posts) == 2
@@ -1,6 +1,8 @@
 import os
 import runpy
 
+import pytest
+
 
 def test_find_pages_sorted(tmp_path):
     # create some page_* image files and other files
@@ -67,3 +69,118 @@ def test_ocr_image_to_text_file_not_found(monkeypatch):
         raise AssertionError("Expected RuntimeError when tesseract not found")
     except RuntimeError as e:
         assert "tesseract not found" in str(e)
+
+
+def test_ocr_dir_streams_and_promotes(monkeypatch, tmp_path):
+    (tmp_path / "page_001.png").write_text("")
+    (tmp_path / "page_002.png").write_text("")
+    mod = runpy.run_path("scripts/ocr_reports.py")
+
+    def fake_run(cmd, capture_output=True, check=True):
+        class R:
+            stdout = f"text of {os.path.basename(cmd[1])}\n".encode("utf-8")
+
+        return R()
+
+    monkeypatch.setattr(mod["subprocess"], "run", fake_run)
+
+    out = tmp_path / "report.txt"
+    mod["ocr_dir"](str(tmp_path), str(out), header="HDR")
+    content = out.read_text(encoding="utf-8")
+    assert content.startswith("HDR")
+    assert "text of page_001.png" in content and "text of page_002.png" in content
+    assert not (tmp_path / "report.txt.part").exists()
+    assert not (tmp_path / "report.txt.progress.json").exists()
+
+
+def test_ocr_dir_resumes_after_interruption(monkeypatch, tmp_path):
+    for i in (1, 2, 3):
+        (tmp_path / f"page_00{i}.png").write_text("")
+    mod = runpy.run_path("scripts/ocr_reports.py")
+
+    calls = []
+
+    def flaky_run(cmd, capture_output=True, check=True):
+        name = os.path.basename(cmd[1])
+        calls.append(name)
+        if name == "page_003.png" and calls.count(name) == 1:
+            raise KeyboardInterrupt()
+
+        class R:
+            stdout = f"text of {name}\n".encode("utf-8")
+
+        return R()
+
+    monkeypatch.setattr(mod["subprocess"], "run", flaky_run)
+
+    out = tmp_path / "report.txt"
+    try:
+        mod["ocr_dir"](str(tmp_path), str(out))
+        raise AssertionError("Expected interruption")
+    except KeyboardInterrupt:
+        pass
+    assert not out.exists()
+    assert (tmp_path / "report.txt.progress.json").exists()
+
+    mod["ocr_dir"](str(tmp_path), str(out))
+    # pages 1 and 2 are not OCRed a second time
+    assert calls == ["page_001.png", "page_002.png", "page_003.png", "page_003.png"]
+    content = out.read_text(encoding="utf-8")
+    assert content.count("----- PAGE:") == 3
+    assert content.count("text of page_001.png") == 1
+
+
+def test_ocr_dir_does_not_resume_into_a_rewritten_part_file(monkeypatch, tmp_path):
+    for i in (1, 2, 3):
+        (tmp_path / f"page_00{i}.png").write_text("")
+    mod = runpy.run_path("scripts/ocr_reports.py")
+    calls = []
+    fail = {"page": "page_003.png"}
+
+    def flaky_run(cmd, capture_output=True, check=True):
+        name = os.path.basename(cmd[1])
+        calls.append(name)
+        if name == fail["page"]:
+            raise KeyboardInterrupt()
+
+        class R:
+            stdout = f"text of {name}\n".encode("utf-8")
+
+        return R()
+
+    monkeypatch.setattr(mod["subprocess"], "run", flaky_run)
+    out = tmp_path / "report.txt"
+    with pytest.raises(KeyboardInterrupt):
+        mod["ocr_dir"](str(tmp_path), str(out))
+    # another run replaced the part file with different text of at least the same size
+    part = tmp_path / "report.txt.part"
+    part.write_text("x" * (part.stat().st_size + 10), encoding="utf-8")
+
+    fail["page"] = None
+    calls.clear()
+    mod["ocr_dir"](str(tmp_path), str(out))
+    assert calls == ["page_001.png", "page_002.png", "page_003.png"]
+    content = out.read_text(encoding="utf-8")
+    assert "x" * 10 not in content and content.count("----- PAGE:") == 3
+
+
+def test_ocr_dir_uses_given_pages_without_listing(monkeypatch, tmp_path):
+    (tmp_path / "page_001.png").write_text("")
+    (tmp_path / "page_002.png").write_text("")
+    mod = runpy.run_path("scripts/ocr_reports.py")
+
+    def fake_run(cmd, capture_output=True, check=True):
+        class R:
+            stdout = f"text of {os.path.basename(cmd[1])}\n".encode("utf-8")
+
+        return R()
+
+    def no_listing(path, *args, **kwargs):
+        raise AssertionError("directory listed again")
+
+    monkeypatch.setattr(mod["subprocess"], "run", fake_run)
+    monkeypatch.setattr(mod["tree_index"], "scan_dir", no_listing)
+    out = tmp_path / "report.txt"
+    mod["ocr_dir"](str(tmp_path), str(out), pages=[str(tmp_path / "page_002.png")])
+    content = out.read_text(encoding="utf-8")
+    assert "text of page_002.png" in content and "page_001" not in content
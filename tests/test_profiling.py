@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import nsfc_final_report.profiling as profiling
+
+
+def test_stage_is_noop_without_active_profiler():
+    assert profiling._active is None
+    with profiling.stage("anything"):
+        pass
+
+
+def test_profiler_nested_stages_and_report(tmp_path):
+    p = profiling.Profiler(trace_memory=True).start()
+    try:
+        with profiling.stage("outer"):
+            with profiling.stage("inner"):
+                sum(range(1000))
+            with profiling.stage("inner"):
+                pass
+    finally:
+        p.stop()
+    assert profiling._active is None
+
+    rep = p.report()
+    assert rep["stages"]["outer"]["count"] == 1
+    assert rep["stages"]["inner"]["count"] == 2
+    assert set(rep["stacks"]) == {"outer", "outer;inner"}
+    assert rep["peak_memory_bytes"] is not None
+
+    paths = p.write(str(tmp_path / "prof" / "run"))
+    with open(paths["json"], encoding="utf-8") as f:
+        assert json.load(f)["stages"]["inner"]["count"] == 2
+    for line in open(paths["collapsed"], encoding="utf-8"):
+        stack, us = line.rsplit(" ", 1)
+        assert stack in ("outer", "outer;inner")
+        assert int(us) >= 0
+
+
+def test_profiler_writes_pstats_with_cprofile(tmp_path):
+    p = profiling.Profiler(cprofile=True).start()
+    with profiling.stage("work"):
+        sorted(range(100))
+    p.stop()
+    paths = p.write(str(tmp_path / "run"))
+    assert os.path.exists(paths["pstats"])
+
+
+def test_profiled_uses_profile_args(tmp_path):
+    parser = argparse.ArgumentParser()
+    profiling.add_profile_args(parser)
+    with profiling.profiled(parser.parse_args([])) as p:
+        assert p is None and profiling._active is None
+    prefix = str(tmp_path / "cli")
+    with profiling.profiled(parser.parse_args(["--profile", prefix])) as p:
+        assert profiling._active is p
+        with profiling.stage("work"):
+            pass
+    assert profiling._active is None
+    with open(prefix + ".json", encoding="utf-8") as f:
+        assert json.load(f)["stages"]["work"]["count"] == 1
+
+
+def test_ocr_scripts_profile_without_http_client():
+    # the OCR scripts import profiling; that must not load requests or the client
+    code = (
+        "import sys, runpy; "
+        "runpy.run_path('scripts/ocr_reports.py'); runpy.run_path('scripts/batch_ocr.py'); "
+        "assert 'nsfc_final_report.client' not in sys.modules; "
+        "assert 'requests' not in sys.modules"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert "DES key" not in proc.stderr
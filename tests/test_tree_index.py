@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import time
+
+from nsfc_final_report import tree_index
+
+
+def _make_tree(tmp_path):
+    tmp_path = tmp_path / "data"
+    tmp_path.mkdir()
+    (tmp_path / "P1").mkdir()
+    (tmp_path / "P1" / "page_002.png").write_text("")
+    (tmp_path / "P1" / "page_001.png").write_text("")
+    (tmp_path / "P2").mkdir()
+    (tmp_path / "P2" / "page_001.jpg").write_text("")
+    (tmp_path / "P2" / "report.txt").write_text("")
+    (tmp_path / "group" / "P3").mkdir(parents=True)
+    (tmp_path / "group" / "P3" / "page_001.png").write_text("")
+    (tmp_path / "group" / "P3" / "report.txt.part").write_text("")
+    (tmp_path / "empty").mkdir()
+    # age every directory past the racy window so listings are cacheable
+    old = time.time() - 60
+    for d in ("P1", "P2", "group/P3", "group", "empty", "."):
+        os.utime(tmp_path / d, (old, old))
+    return tmp_path
+
+
+def test_index_tree_children_and_recursive(tmp_path):
+    tmp_path = _make_tree(tmp_path)
+
+    projects = tree_index.index_tree(str(tmp_path))
+    assert [os.path.basename(p.path) for p in projects] == ["P1", "P2"]
+    p1, p2 = projects
+    assert [os.path.basename(x) for x in p1.pages] == ["page_001.png", "page_002.png"]
+    assert not p1.has_report and p2.has_report
+
+    projects = tree_index.index_tree(str(tmp_path), recursive=True, workers=2)
+    rel = [os.path.relpath(p.path, tmp_path) for p in projects]
+    assert rel == ["P1", "P2", os.path.join("group", "P3")]
+    assert projects[2].has_partial and not projects[2].has_report
+
+
+def test_index_tree_manifest_skips_unchanged_dirs(monkeypatch, tmp_path):
+    manifest = str(tmp_path / "cache" / "index.json")
+    tmp_path = _make_tree(tmp_path)
+
+    first = tree_index.index_tree(str(tmp_path), recursive=True, manifest_path=manifest)
+    assert os.path.exists(manifest)
+
+    real_scandir = os.scandir
+    scanned = []
+
+    def counting_scandir(path):
+        scanned.append(os.path.relpath(path, tmp_path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(tree_index.os, "scandir", counting_scandir)
+    second = tree_index.index_tree(
+        str(tmp_path), recursive=True, manifest_path=manifest
+    )
+    assert second == first
+    assert scanned == []
+
+    # a new report in P1 changes its mtime, so only P1 is listed again
+    (tmp_path / "P1" / "report.txt").write_text("")
+    third = tree_index.index_tree(str(tmp_path), recursive=True, manifest_path=manifest)
+    assert scanned == ["P1"]
+    assert third[0].has_report
+
+
+def test_index_tree_follows_symlinked_children_only_at_top_level(tmp_path):
+    tmp_path = _make_tree(tmp_path)
+    elsewhere = tmp_path.parent / "elsewhere" / "P9"
+    elsewhere.mkdir(parents=True)
+    (elsewhere / "page_001.png").write_text("")
+    os.symlink(elsewhere, tmp_path / "P9")
+    os.symlink(elsewhere.parent, tmp_path / "group" / "linked")
+
+    projects = tree_index.index_tree(str(tmp_path))
+    assert [os.path.basename(p.path) for p in projects] == ["P1", "P2", "P9"]
+
+    # like os.walk, recursion does not descend into symlinked directories
+    projects = tree_index.index_tree(str(tmp_path), recursive=True)
+    rel = [os.path.relpath(p.path, tmp_path) for p in projects]
+    assert rel == ["P1", "P2", os.path.join("group", "P3")]
+
+
+def test_tree_index_imports_without_http_client():
+    code = (
+        "import sys, nsfc_final_report.tree_index; "
+        "assert 'nsfc_final_report.client' not in sys.modules; "
+        "assert 'requests' not in sys.modules"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert "DES key" not in proc.stderr